@@ -4,11 +4,45 @@ import os
 import sys
 import json
 import shutil
-import tempfile
+import stat
+import posixpath
+import time
+import mmap
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 import configparser
 from pathlib import Path
 import re
+import types
+
+# Indent written JSON, set from config by main. Minecraft doesn't care about formatting,
+# so output is compact unless pretty_json is enabled.
+PRETTY_JSON = False
+
+# Use orjson for JSON parsing/serialization when installed, else fall back to stdlib json
+try:
+    import orjson
+    _loads = orjson.loads
+
+    def _dumps(obj):
+        if PRETTY_JSON:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+    def _dumps(obj):
+        if PRETTY_JSON:
+            return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode('utf-8')
+
+# Pre-compiled matchers for texture names that need rewriting / the first '_'-separated
+# name segment containing a digit
+_HAS_ALPHA = re.compile(r"[A-Za-z_]").search
+_FIRST_DIGIT_SEGMENT = re.compile(r"(?:^|_)([^_]*[0-9])").search
 
 # ---------------------------
 # Config & helpers
@@ -26,74 +60,128 @@ def load_config():
     patched_prefix = DEFAULT.get("patched_prefix", "Patched ")
     generated_name_default = DEFAULT.get("generated_name_default", "generated-resources")
 
+    # Load numeric options (0 = one worker per CPU)
+    try:
+        workers = int(DEFAULT.get("workers", "1"))
+    except ValueError:
+        workers = 1
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    # ProcessPoolExecutor rejects more than 61 workers on Windows
+    if sys.platform == "win32":
+        workers = min(workers, 61)
+
     # Load boolean options
     verbose = DEFAULT.get("verbose", "true").lower() in ("1", "true", "yes")
     prompt_for_generated_name = DEFAULT.get("prompt_for_generated_name", "true").lower() in ("1", "true", "yes")
+    pretty_json = DEFAULT.get("pretty_json", "false").lower() in ("1", "true", "yes")
 
     return {
         "generated_folder_name": generated_folder_name,
         "patched_prefix": patched_prefix,
         "generated_name_default": generated_name_default,
         "verbose": verbose,
-        "prompt_for_generated_name": prompt_for_generated_name
+        "prompt_for_generated_name": prompt_for_generated_name,
+        "pretty_json": pretty_json,
+        "workers": workers
     }
 
 # Ensure directory exists
 def ensure_dir(path):
     os.makedirs(path, exist_ok=True)
 
+# Buffer size for streamed copies that can't be handed to the kernel (e.g. zip to zip)
+COPY_BUFSIZE = 1 << 20
+
+# Copy file contents only (no metadata), letting the kernel move the bytes where possible
+def fast_copy(src, dst):
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        # some filesystems report success but copy nothing; let copyfile redo it
+                        raise OSError("copy_file_range copied 0 bytes")
+                    remaining -= copied
+            return
+        except OSError:
+            pass
+    # copyfile already uses sendfile/fcopyfile where the platform offers them
+    shutil.copyfile(src, dst)
+
 # Copy all root-level files and directories except "assets"
 def copy_root_files(src_root, dest_root):
-    for item in os.listdir(src_root):
-        if item.lower() == "assets":
-            continue
-        src_item = os.path.join(src_root, item)
-        dest_item = os.path.join(dest_root, item)
-        if os.path.isdir(src_item):
-            if os.path.exists(dest_item):
-                log(f"Skipping existing directory {dest_item}")
-            else:
+    with os.scandir(src_root) as it:
+        for entry in it:
+            item = entry.name
+            if item.lower() == "assets":
+                continue
+            dest_item = os.path.join(dest_root, item)
+            is_dir = entry.is_dir()
+            if os.path.lexists(dest_item):
+                log(f"Skipping existing {'directory' if is_dir else 'file'} {dest_item}")
+            elif is_dir:
                 try:
-                    shutil.copytree(src_item, dest_item)
+                    shutil.copytree(entry.path, dest_item, copy_function=fast_copy)
                     log(f"Copied directory {item} -> {dest_item}")
                 except Exception as e:
                     log(f"Failed copying directory {item}: {e}")
-        else:
-            if os.path.exists(dest_item):
-                log(f"Skipping existing file {dest_item}")
             else:
-                shutil.copy2(src_item, dest_item)
+                fast_copy(entry.path, dest_item)
                 log(f"Copied file {item} -> {dest_item}")
 
-# Simple .properties parser
-def parse_properties(file_path):
+# Simple .properties parser over the raw file bytes; only keys/values are decoded
+def parse_properties(raw):
     data = {}
-    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            data[key.strip()] = value.strip()
+    for line in raw.splitlines():
+        line = line.strip()
+        if not line or line[:1] in b"#!":
+            continue
+        eq = line.find(b"=")
+        if eq < 0:
+            continue
+        data[line[:eq].strip().decode("utf-8", "ignore")] = line[eq + 1:].strip().decode("utf-8", "ignore")
     return data
 
-# Transform filename -> case "when" value to reflect vanilla style
-def transform_name_to_vanilla(filename_no_ext):
-    parts = filename_no_ext.split('_')
-    idx = None
-    for i, p in enumerate(parts):
+# Read and parse a .properties CIT entry
+def load_properties(entry, source):
+    return parse_properties(source.read(entry.path))
+
+# True if dest exists and was written no earlier than the source was last modified
+def is_up_to_date(dest, src_stat):
+    try:
+        return os.stat(dest).st_mtime_ns >= src_stat.st_mtime_ns
+    except OSError:
+        return False
+
+# Find the first '_'-separated segment containing a digit (as str.isdigit sees it);
+# returns (end of the head before it, start of the segment) or None.
+# ASCII names use the regex; others are scanned, since str.isdigit also accepts e.g. '²'
+def _first_digit_segment(name):
+    if name.isascii():
+        m = _FIRST_DIGIT_SEGMENT(name)
+        return None if m is None else (m.start(), m.start(1))
+    start = 0
+    for p in name.split('_'):
         if any(ch.isdigit() for ch in p):
-            idx = i
-            break
-    if idx is None:
+            return (max(start - 1, 0), start)
+        start += len(p) + 1
+    return None
+
+# Transform filename -> case "when" value to reflect vanilla style (pure, so memoized)
+@lru_cache(maxsize=None)
+def transform_name_to_vanilla(filename_no_ext):
+    split = _first_digit_segment(filename_no_ext)
+    if split is None:
         # No numeric segment: capitalize and join with spaces
-        head = ' '.join(p.capitalize() for p in parts if p != '')
+        head = ' '.join(p.capitalize() for p in filename_no_ext.split('_') if p != '')
         return head
     else:
-        head_parts = parts[:idx]
-        tail_parts = parts[idx:]
-        head = ' '.join(p.capitalize() for p in head_parts if p != '')
-        tail = '_'.join(tail_parts)
+        # Everything from the first '_'-separated segment containing a digit is kept as-is
+        head = ' '.join(p.capitalize() for p in filename_no_ext[:split[0]].split('_') if p != '')
+        tail = filename_no_ext[split[1]:]
         return f"{head}_{tail}" if head else tail
 
 # Load block names from minecraft_blocks.txt to check block vs item fallbacks
@@ -109,107 +197,145 @@ def load_block_names():
         log(f"Loaded {len(names)} block names from {block_file}")
     else:
         log(f"Warning: {block_file} not found; defaulting to items-only fallback")
-    return names
+    return frozenset(names)
 
 # JSON helpers
-def safe_load_json(path):
+def safe_load_json(raw):
+    if raw is None:
+        return None
     try:
-        return json.loads(Path(path).read_text(encoding='utf-8'))
+        return _loads(raw)
     except Exception:
         return None
 
-# Write JSON with pretty formatting
-def write_json_pretty(path, obj):
-    Path(path).write_text(json.dumps(obj, indent=2, ensure_ascii=False), encoding='utf-8')
-
-# Prints only if verbose is enabled in config (set by main)
+# Write data to path unless the file already holds exactly these bytes. With touch, a
+# skipped write still bumps the mtime, for outputs that is_up_to_date checks against their source.
+def write_bytes_if_changed(path, data, touch=False):
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, "rb") as f:
+                same = f.read() == data
+            if same:
+                if touch:
+                    os.utime(path)
+                return
+    except OSError:
+        pass
+    with open(path, "wb") as f:
+        f.write(data)
+
+# Write JSON (indented only if pretty_json is set)
+def write_json_file(path, obj):
+    write_bytes_if_changed(path, _dumps(obj))
+
+# Verbose logging flag, set from config by main. Per-file loops check it before
+# building their f-string messages so quiet runs skip the formatting entirely.
+VERBOSE = True
+
+# Prints only if verbose is enabled
 def log(msg):
-    if GLOBAL_CONFIG.get("verbose", True):
+    if VERBOSE:
         print(msg)
 
 # ---------------------------
 # Item JSON merging (selector)
 # ---------------------------
 
-# Merge or create item JSON with select model for custom_name component
-def merge_item_json(item_json_path, case_when, case_model_path, fallback_model):
-    existing = safe_load_json(item_json_path)
+# Build the fallback block for an item JSON from a model path or special definition
+def make_fallback_block(fallback_model):
+    if isinstance(fallback_model, dict):
+        # Directly use complex/special fallback definition
+        return fallback_model
+    # Normal string fallback path
+    return {
+        "type": "minecraft:model",
+        "model": fallback_model,
+        "tints": []
+    }
+
+# Load an existing item JSON (or create a new one) with select model for custom_name component;
+# returns (item_json, set of the "when" values already among its cases)
+def load_item_json(output, item_json_path, fallback_model):
+    existing = safe_load_json(output.read(item_json_path))
     if existing and isinstance(existing, dict):
         try:
-            model_block = existing.setdefault("model", {})
-            model_block.setdefault("type", "minecraft:select")
-            model_block.setdefault("property", "minecraft:component")
-            model_block.setdefault("component", "minecraft:custom_name")
-            cases = model_block.setdefault("cases", [])
-            if any(c.get("when") == case_when for c in cases):
-                log(f"Case '{case_when}' already present in {item_json_path}; skipping append")
-            else:
-                cases.append({
-                    "when": case_when,
-                    "model": {
-                        "type": "minecraft:model",
-                        "model": case_model_path
-                    }
-                })
-            if isinstance(fallback_model, dict):
-                # Directly use complex/special fallback definition
-                model_block.setdefault("fallback", fallback_model)
-            else:
-                # Normal string fallback path
-                model_block.setdefault("fallback", {
-                    "type": "minecraft:model",
-                    "model": fallback_model,
-                    "tints": []
-                })
-            write_json_pretty(item_json_path, existing)
-            return
+            if "model" not in existing:
+                existing["model"] = {}
+            model_block = existing["model"]
+            setd = model_block.setdefault
+            setd("type", "minecraft:select")
+            setd("property", "minecraft:component")
+            setd("component", "minecraft:custom_name")
+            if "cases" not in model_block:
+                model_block["cases"] = []
+            elif not isinstance(model_block["cases"], list):
+                raise TypeError("'cases' is not a list")
+            seen_whens = set()
+            for case in model_block["cases"]:
+                if not isinstance(case, dict):
+                    raise TypeError(f"case {case!r} is not an object")
+                when = case.get("when")
+                # a list-valued "when" never equals a single generated name, so it is not recorded
+                if not isinstance(when, (list, dict)):
+                    seen_whens.add(when)
+            if "fallback" not in model_block:
+                model_block["fallback"] = make_fallback_block(fallback_model)
+            return existing, seen_whens
         except Exception as e:
-            log(f"Could not merge into existing {item_json_path}: {e}")
+            log(f"Could not merge into existing {output.path(item_json_path)}: {e}")
 
     # create new structure if we couldn't merge
-    if isinstance(fallback_model, dict):
-        fallback_block = fallback_model
-    else:
-        fallback_block = {
-            "type": "minecraft:model",
-            "model": fallback_model,
-            "tints": []
-        }
-
-    new_obj = {
+    return {
         "model": {
             "type": "minecraft:select",
             "property": "minecraft:component",
             "component": "minecraft:custom_name",
-            "cases": [
-                {
-                    "when": case_when,
-                    "model": {
-                        "type": "minecraft:model",
-                        "model": case_model_path
-                    }
-                }
-            ],
-            "fallback": fallback_block
+            "cases": [],
+            "fallback": make_fallback_block(fallback_model)
         }
-    }
-    write_json_pretty(item_json_path, new_obj)
+    }, set()
+
+# Add a case to the in-memory item JSON for item_json_path; written out by flush_item_jsons.
+# item_json_accum maps item_json_path -> (item_json, its cases list, set of "when" values in it)
+def accumulate_item_case(item_json_accum, output, item_json_path, case_when, case_model_path, fallback_model):
+    accum = item_json_accum.get(item_json_path)
+    if accum is None:
+        item_json, seen_whens = load_item_json(output, item_json_path, fallback_model)
+        accum = item_json_accum[item_json_path] = (item_json, item_json["model"]["cases"], seen_whens)
+    _, cases, seen_whens = accum
+    if case_when in seen_whens:
+        if VERBOSE:
+            log(f"Case '{case_when}' already present in {output.path(item_json_path)}; skipping append")
+        return
+    seen_whens.add(case_when)
+    cases.append({
+        "when": case_when,
+        "model": {
+            "type": "minecraft:model",
+            "model": case_model_path
+        }
+    })
+
+# Write every accumulated item JSON once
+def flush_item_jsons(output, item_json_accum):
+    for item_json_path, (item_json, _, _) in item_json_accum.items():
+        output.write_json(item_json_path, item_json)
 
 # ---------------------------
 # Model JSON texture rewriting
 # ---------------------------
 
-# Rewrite model JSON textures to use generated namespace
-def rewrite_model_textures_and_write(src_json_path, dest_json_path, generated_folder_name):
+# Rewrite model JSON textures to use generated namespace; returns the bytes to write
+def rewrite_model_textures(source, src_json_path, generated_folder_name):
+    raw = source.read(src_json_path)
     try:
-        data = json.loads(Path(src_json_path).read_text(encoding='utf-8'))
+        data = _loads(raw)
     except Exception as e:
         log(f"Couldn't parse JSON {src_json_path}: {e}. Copying raw file.")
-        shutil.copy2(src_json_path, dest_json_path)
-        return
+        return raw
 
     # --- Resolve parent display transforms ---
-    data = resolve_model_parents(data, Path(src_json_path).parent)
+    data = resolve_model_parents(data, source, src_json_path)
 
     # --- Rewrite textures ---
     if isinstance(data, dict) and "textures" in data and isinstance(data["textures"], dict):
@@ -224,31 +350,47 @@ def rewrite_model_textures_and_write(src_json_path, dest_json_path, generated_fo
                 base = v
             if ":" in base or "/" in base:
                 continue
-            if re.search(r"[A-Za-z_]", base):
+            if _HAS_ALPHA(base):
                 new_val = f"{generated_folder_name}:item/{base}"
                 textures[key] = new_val
-                log(f"Rewrote texture '{val}' -> '{new_val}' in {src_json_path}")
+                if VERBOSE:
+                    log(f"Rewrote texture '{val}' -> '{new_val}' in {src_json_path}")
 
-    write_json_pretty(dest_json_path, data)
+    return _dumps(data)
 
 # Resolves texture key references like "#trapdoor" -> the actual texture path.
+# Follows each "#ref" chain directly in one pass, stopping on unknown keys or cycles.
 def resolve_texture_references(textures):
     resolved = dict(textures)
-    changed = True
-    while changed:
-        changed = False
-        for key, val in list(resolved.items()):
-            if isinstance(val, str) and val.startswith("#"):
-                ref_key = val[1:]
-                if ref_key in resolved and resolved[ref_key] != val:
-                    resolved[key] = resolved[ref_key]
-                    changed = True
+    for key in resolved:
+        val = resolved[key]
+        seen = set()
+        while isinstance(val, str) and val.startswith("#"):
+            ref_key = val[1:]
+            if ref_key not in resolved or ref_key in seen:
+                break
+            seen.add(ref_key)
+            val = resolved[ref_key]
+        resolved[key] = val
     return resolved
 
+# Intern texture path strings in place so models sharing textures share one string object
+def intern_texture_strings(data):
+    textures = data.get("textures")
+    if isinstance(textures, dict):
+        for key, val in textures.items():
+            if isinstance(val, str):
+                textures[key] = sys.intern(val)
+
+# Fully-resolved parent models keyed by parent file path, reset per pack
+_PARENT_CACHE = {}
+
 # Recursively resolve parent models and merge fields, child overrides parent.
-def resolve_model_parents(data, src_folder, visited=None):
+# Parents are looked up next to src_json_path in the same pack source.
+def resolve_model_parents(data, source, src_json_path, visited=None):
     if not isinstance(data, dict):
         return data
+    intern_texture_strings(data)
 
     if visited is None:
         visited = set()
@@ -257,22 +399,27 @@ def resolve_model_parents(data, src_folder, visited=None):
     if not parent_path or not parent_path.startswith("./"):
         return data
 
-    parent_file = Path(src_folder) / (Path(parent_path).stem + ".json")
+    parent_file = source.sibling(src_json_path, os.path.splitext(os.path.basename(parent_path))[0] + ".json")
 
-    # Prevent infinite loops
-    if parent_file in visited:
-        log(f"Cycle detected for {parent_file}, skipping")
-        return data
-    visited.add(parent_file)
+    # Reuse an already-resolved parent; it is only ever copied from, never mutated
+    parent_data = _PARENT_CACHE.get(parent_file)
+    if parent_data is None:
+        # Prevent infinite loops
+        if parent_file in visited:
+            log(f"Cycle detected for {parent_file}, skipping")
+            return data
+        visited.add(parent_file)
 
-    if not parent_file.exists():
-        log(f"Parent {parent_file} not found")
-        data.pop("parent", None)
-        return data
+        if not source.exists(parent_file):
+            log(f"Parent {parent_file} not found")
+            data.pop("parent", None)
+            return data
 
     try:
-        parent_data = json.loads(parent_file.read_text(encoding='utf-8'))
-        parent_data = resolve_model_parents(parent_data, src_folder, visited)
+        if parent_data is None:
+            parent_data = _loads(source.read(parent_file))
+            parent_data = resolve_model_parents(parent_data, source, parent_file, visited)
+            _PARENT_CACHE[parent_file] = parent_data
 
         # --- Merge all relevant fields ---
         merged = dict(parent_data)  # start from parent copy
@@ -312,6 +459,220 @@ def resolve_model_parents(data, src_folder, visited=None):
         data.pop("parent", None)
         return data
 
+# ---------------------------
+# Pack sources and outputs (zip or folder)
+# ---------------------------
+
+# Pack-relative locations (always "/"-separated, as inside a zip)
+CIT_DIR = "assets/minecraft/optifine/cit"
+ITEMS_DIR = "assets/minecraft/items"
+
+# Recursively yield file entries below path using cached os.scandir metadata
+def _scan(path):
+    with os.scandir(path) as it:
+        for e in it:
+            if e.is_dir(follow_symlinks=False):
+                yield from _scan(e.path)
+            elif e.is_file(follow_symlinks=False):
+                yield e
+
+# Reads a resource pack folder; CIT entries are os.DirEntry objects
+class FolderSource:
+    def __init__(self, root):
+        self.root = str(root)
+        self.cit_dir = os.path.join(self.root, CIT_DIR)
+
+    def has_cit(self):
+        return os.path.isdir(self.cit_dir)
+
+    def iter_cit(self):
+        return _scan(self.cit_dir)
+
+    def size(self, entry):
+        return entry.stat().st_size
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def open(self, path):
+        return open(path, "rb")
+
+    def exists(self, path):
+        return os.path.isfile(path)
+
+    def sibling(self, path, name):
+        return os.path.join(os.path.dirname(path), name)
+
+    def copy_root_files(self, output):
+        copy_root_files(self.root, output.root)
+
+    def close(self):
+        pass
+
+# Minimal os.DirEntry stand-in for a file inside a zip
+class ZipEntry:
+    __slots__ = ("info", "path", "name")
+
+    def __init__(self, info):
+        self.info = info
+        self.path = info.filename
+        self.name = posixpath.basename(info.filename)
+
+# Zips up to this size are memory-mapped, so member reads are served from the page
+# cache instead of many small seek/read syscalls; larger ones use a plain file to keep RSS down
+MMAP_MAX_BYTES = 512 << 20
+
+# mmap only gained seekable() in Python 3.13, and ZipFile needs it to share the handle
+class _MappedZip(mmap.mmap):
+    def seekable(self):
+        return True
+
+# Reads a resource pack zip directly, without extracting it to disk
+class ZipSource:
+    def __init__(self, zip_path):
+        self.mmap = None
+        with open(zip_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if 0 < size <= MMAP_MAX_BYTES:
+                self.mmap = _MappedZip(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.zip = zipfile.ZipFile(self.mmap if self.mmap is not None else zip_path, "r")
+        self.cit_dir = CIT_DIR
+        self.names = set()
+        self.cit_entries = []
+        self.root_infos = []
+
+        # Route every archive member once: CIT inputs, root-level files, or other assets (dropped)
+        prefix = CIT_DIR + "/"
+        for info in self.zip.infolist():
+            if info.is_dir():
+                continue
+            filename = info.filename
+            self.names.add(filename)
+            lower = filename.lower()
+            if lower.startswith(prefix):
+                self.cit_entries.append(ZipEntry(info))
+            elif lower.split("/", 1)[0] != "assets":
+                self.root_infos.append(info)
+
+    def has_cit(self):
+        return bool(self.cit_entries)
+
+    def iter_cit(self):
+        return iter(self.cit_entries)
+
+    def size(self, entry):
+        return entry.info.file_size
+
+    def read(self, path):
+        return self.zip.read(path)
+
+    def open(self, path):
+        return self.zip.open(path)
+
+    def exists(self, path):
+        return path in self.names
+
+    def sibling(self, path, name):
+        return posixpath.join(posixpath.dirname(path), name)
+
+    # Copy all root-level files and directories except "assets"
+    def copy_root_files(self, output):
+        for info in self.root_infos:
+            if output.exists(info.filename):
+                if VERBOSE:
+                    log(f"Skipping existing file {info.filename}")
+            else:
+                output.write_bytes(info.filename, self.zip.read(info))
+                if VERBOSE:
+                    log(f"Copied file {info.filename}")
+
+    def close(self):
+        self.zip.close()
+        if self.mmap is not None:
+            self.mmap.close()
+
+# Writes the patched pack into a folder; paths are pack-relative and their
+# directories must already exist (process_pack creates them up front)
+class FolderOutput:
+    def __init__(self, root):
+        self.root = str(root)
+        # rel paths are never absolute, so a plain concat matches os.path.join
+        self.prefix = self.root if self.root.endswith(os.sep) else self.root + os.sep
+
+    def path(self, rel):
+        return self.prefix + rel
+
+    def exists(self, rel):
+        return os.path.exists(self.path(rel))
+
+    def is_up_to_date(self, rel, entry):
+        return is_up_to_date(self.path(rel), entry.stat())
+
+    def read(self, rel):
+        try:
+            with open(self.path(rel), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def write_bytes(self, rel, data, touch=False):
+        write_bytes_if_changed(self.path(rel), data, touch)
+
+    def write_json(self, rel, obj):
+        write_json_file(self.path(rel), obj)
+
+    def copy_file(self, source, entry, rel):
+        fast_copy(entry.path, self.path(rel))
+
+    def close(self):
+        pass
+
+# Writes the patched pack straight into a new zip; paths are archive names.
+# JSON and other text deflate at level 1; PNGs are already deflate-compressed and
+# never shrink, so they are stored as-is.
+class ZipOutput:
+    def __init__(self, zip_path):
+        self.zip = zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1)
+        self.names = set()
+
+    # Member header: regular file with rw-r--r-- permissions, like ZipFile.write gives
+    # for files on disk (the bare-name default is owner-only with no file-type bits)
+    def zinfo(self, rel):
+        info = zipfile.ZipInfo(rel, date_time=time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_STORED if rel.lower().endswith(".png") else zipfile.ZIP_DEFLATED
+        info.external_attr = (stat.S_IFREG | 0o644) << 16
+        return info
+
+    def path(self, rel):
+        return rel
+
+    def exists(self, rel):
+        return rel in self.names
+
+    # Nothing in a fresh archive is stale; anything already written wins
+    def is_up_to_date(self, rel, entry):
+        return rel in self.names
+
+    def read(self, rel):
+        return None
+
+    def write_bytes(self, rel, data, touch=False):
+        self.zip.writestr(self.zinfo(rel), data, compresslevel=self.zip.compresslevel)
+        self.names.add(rel)
+
+    def write_json(self, rel, obj):
+        self.write_bytes(rel, _dumps(obj))
+
+    # Stream the member across instead of holding the whole file in memory
+    def copy_file(self, source, entry, rel):
+        with source.open(entry.path) as fsrc, self.zip.open(self.zinfo(rel), "w") as fdst:
+            shutil.copyfileobj(fsrc, fdst, COPY_BUFSIZE)
+        self.names.add(rel)
+
+    def close(self):
+        self.zip.close()
+
 # ---------------------------
 # CIT processing
 # ---------------------------
@@ -428,146 +789,248 @@ FALLBACK_OVERRIDES["clock"] = {
     "property": "context_dimension"
 }
 
-# Process files based on type
-def process_cit_file(src_path, dest_items_path, generated_asset_root, generated_folder_name, block_names):
-    src_path = Path(src_path)
-    lower = src_path.suffix.lower()
-    if lower == ".properties":
-        props = parse_properties(str(src_path))
-        # matchItems can be missing variants - check multiple keys
-        match_items_value = props.get("matchItems") or props.get("match_items") or props.get("matchitems")
-        if not match_items_value:
-            log(f"No matchItems in {src_path}; skipping")
-            return
-        # process each token
-        tokens = re.split(r'\s+', match_items_value.strip())
-        # model field
-        model_field = props.get("model") or props.get("Model") or props.get("model-file")
-        if not model_field:
-            log(f"No model= in {src_path}; skipping")
-            return
-        model_name = Path(model_field).stem  # e.g., apple_0
-        prop_stem = src_path.stem
-        for tok in tokens:
-            if not tok:
-                continue
-            if ':' in tok:
-                ns, item_name = tok.split(':', 1)
-            else:
-                ns, item_name = 'minecraft', tok
-
-            # compute case_when now that we know the property stem AND the item_name
-            case_when = transform_name_to_vanilla(prop_stem)
+# Freeze the finished table into a read-only view
+FALLBACK_OVERRIDES = types.MappingProxyType(FALLBACK_OVERRIDES)
+
+# Colored beds and banners get their color name prepended to the case "when" (e.g. "Brown Bed_0")
+COLOR_PREFIXES = types.MappingProxyType({
+    f"{color}_{kind}": f"{color.title()} " for color in COLORS for kind in ("bed", "banner")
+})
+
+# Add the item JSON cases described by one parsed CIT .properties file
+def add_properties_cases(entry, props, output, generated_folder_name, block_names, item_json_accum):
+    src_path = entry.path
+    name = entry.name
+    # matchItems can be missing variants - check multiple keys
+    match_items_value = props.get("matchItems") or props.get("match_items") or props.get("matchitems")
+    if not match_items_value:
+        log(f"No matchItems in {src_path}; skipping")
+        return
+    # process each token
+    tokens = match_items_value.split()
+    # model field
+    model_field = props.get("model") or props.get("Model") or props.get("model-file")
+    if not model_field:
+        log(f"No model= in {src_path}; skipping")
+        return
+    model_name = os.path.splitext(os.path.basename(model_field))[0]  # e.g., apple_0
+    case_model_path = f"{generated_folder_name}:item/{model_name}"
+    # "when" value derived from the property stem, same for every token of this file
+    stem_when = transform_name_to_vanilla(name[:name.rfind('.')])
+    # bind module-level lookups once; the token loop below runs for every matchItems entry
+    color_prefix = COLOR_PREFIXES.get
+    override = FALLBACK_OVERRIDES.get
+    accumulate = accumulate_item_case
+    verbose = VERBOSE
+    for tok in tokens:
+        if not tok:
+            continue
+        if ':' in tok:
+            ns, item_name = tok.split(':', 1)
+        else:
+            ns, item_name = 'minecraft', tok
 
-            # If this is a colored bed or banner, prepend the color name (e.g. "Brown Bed_0")
-            for color in COLORS:
-                if item_name == f"{color}_bed" or item_name == f"{color}_banner":
-                    case_when = f"{color.title()} {case_when}"
-                    break
+        # If this is a colored bed or banner, prepend the color name (e.g. "Brown Bed_0")
+        prefix = color_prefix(item_name)
+        case_when = stem_when if prefix is None else prefix + stem_when
 
-            # decide fallback block/item via block_names set
-            if item_name in FALLBACK_OVERRIDES:
-                fallback = FALLBACK_OVERRIDES[item_name]
-            elif item_name in block_names:
+        # decide fallback block/item via block_names set
+        fallback = override(item_name)
+        if fallback is None:
+            if item_name in block_names:
                 fallback = f"minecraft:block/{item_name}"
             else:
                 fallback = f"minecraft:item/{item_name}"
 
-            item_json_path = os.path.join(dest_items_path, f"{item_name}.json")
-            case_model_path = f"{generated_folder_name}:item/{model_name}"
-            merge_item_json(item_json_path, case_when, case_model_path, fallback)
-            log(f"Added/updated case '{case_when}' -> {case_model_path} to {item_json_path}")
+        item_json_path = f"{ITEMS_DIR}/{item_name}.json"
+        accumulate(item_json_accum, output, item_json_path, case_when, case_model_path, fallback)
+        if verbose:
+            log(f"Added/updated case '{case_when}' -> {case_model_path} to {output.path(item_json_path)}")
 
-    elif lower == ".png":
-        dest = os.path.join(generated_asset_root, "textures", "item", src_path.name)
-        if os.path.exists(dest):
-            log(f"Skipping existing texture {dest}")
-        else:
-            shutil.copy2(str(src_path), dest)
-            log(f"Copied PNG {src_path} -> {dest}")
-
-    elif lower == ".json":
-        # when copying model JSONs, rewrite textures if necessary
-        dest = os.path.join(generated_asset_root, "models", "item", src_path.name)
-        if os.path.exists(dest):
-            log(f"Skipping existing model {dest}")
-        else:
-            rewrite_model_textures_and_write(str(src_path), dest, generated_folder_name)
-            log(f"Copied/rewrote model JSON {src_path} -> {dest}")
+# Below this many files, thread pool start-up costs more than it saves
+PARALLEL_MIN_FILES = 64
+
+# Model rewrites take ~25 us each, while starting worker processes takes ~0.5-1 s under
+# spawn (the Windows default), so the process pool only pays off on very large packs
+PARALLEL_MIN_MODELS = 20000
+
+# Per-process pack source for model workers, set by _init_model_worker
+_WORKER_SOURCE = None
+
+def _init_model_worker(verbose, pretty_json, input_path, is_zip):
+    global VERBOSE, PRETTY_JSON, _WORKER_SOURCE
+    VERBOSE = verbose
+    PRETTY_JSON = pretty_json
+    _WORKER_SOURCE = ZipSource(input_path) if is_zip else FolderSource(input_path)
+
+def _rewrite_model_in_worker(src_json_path, generated_folder_name):
+    return rewrite_model_textures(_WORKER_SOURCE, src_json_path, generated_folder_name)
+
+# Read and parse CIT .properties files, yielding (entry, props) in walk order.
+# Folder packs read on a thread pool, since many small file reads are I/O-bound.
+def load_all_properties(props_entries, source, workers):
+    if workers > 1 and len(props_entries) >= PARALLEL_MIN_FILES and isinstance(source, FolderSource):
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            yield from zip(props_entries, ex.map(load_properties, props_entries, repeat(source)))
+    else:
+        for entry in props_entries:
+            yield entry, load_properties(entry, source)
+
+# Copy CIT textures into the generated namespace; first non-empty texture with a given name wins.
+# Folder outputs copy on a thread pool; zip outputs must be written from one thread.
+def copy_cit_textures(png_entries, source, output, textures_item_dir, workers):
+    prefix = textures_item_dir + "/"
+    jobs = []
+    claimed = set()
+    for entry in png_entries:
+        if not source.size(entry):
+            if VERBOSE:
+                log(f"Skipping empty texture {entry.path}")
+            continue
+        dest = prefix + entry.name
+        if dest in claimed or output.exists(dest):
+            if VERBOSE:
+                log(f"Skipping existing texture {output.path(dest)}")
+            continue
+        claimed.add(dest)
+        jobs.append((entry, dest))
+
+    def copy(job):
+        entry, dest = job
+        output.copy_file(source, entry, dest)
+        return job
+
+    if workers > 1 and len(jobs) >= PARALLEL_MIN_FILES and isinstance(output, FolderOutput):
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            done = ex.map(copy, jobs)
+            for entry, dest in done:
+                if VERBOSE:
+                    log(f"Copied PNG {entry.path} -> {output.path(dest)}")
     else:
-        log(f"Ignored CIT file type: {src_path}")
+        for entry, dest in map(copy, jobs):
+            if VERBOSE:
+                log(f"Copied PNG {entry.path} -> {output.path(dest)}")
+
+# Rewrite CIT model JSONs into the generated namespace; first non-empty model with a given name wins.
+# Large packs parse/rewrite on worker processes; results are written here in walk order.
+def write_cit_models(json_entries, source, output, models_item_dir, generated_folder_name, workers, input_path, is_zip):
+    prefix = models_item_dir + "/"
+    jobs = []
+    claimed = set()
+    for entry in json_entries:
+        if not source.size(entry):
+            if VERBOSE:
+                log(f"Skipping empty model {entry.path}")
+            continue
+        dest = prefix + entry.name
+        if dest in claimed:
+            if VERBOSE:
+                log(f"Skipping model {entry.path}; {output.path(dest)} already claimed")
+            continue
+        # claimed even when up to date, so a newer same-named model can't take it over
+        claimed.add(dest)
+        if output.is_up_to_date(dest, entry):
+            if VERBOSE:
+                log(f"Skipping up-to-date model {output.path(dest)}")
+            continue
+        jobs.append((entry.path, dest))
+
+    srcs = [src for src, _ in jobs]
+    if workers > 1 and len(jobs) >= PARALLEL_MIN_MODELS:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_model_worker,
+                                 initargs=(VERBOSE, PRETTY_JSON, str(input_path), is_zip)) as ex:
+            rendered = ex.map(_rewrite_model_in_worker, srcs, repeat(generated_folder_name), chunksize=32)
+            for (src, dest), data in zip(jobs, rendered):
+                output.write_bytes(dest, data, touch=True)
+                if VERBOSE:
+                    log(f"Copied/rewrote model JSON {src} -> {output.path(dest)}")
+    else:
+        for src, dest in jobs:
+            output.write_bytes(dest, rewrite_model_textures(source, src, generated_folder_name), touch=True)
+            if VERBOSE:
+                log(f"Copied/rewrote model JSON {src} -> {output.path(dest)}")
 
 # ---------------------------
 # Main pack processing (zip or folder)
 # ---------------------------
 
 # Process a resource pack (zip or folder)
-def process_pack(input_path, generated_folder_name, block_names):
+def process_pack(input_path, generated_folder_name, block_names, workers=1):
+    _PARENT_CACHE.clear()
+
     input_path = Path(input_path)
     base_name = input_path.stem
     output_name = f"Patched {base_name}"
-    temp_dir = None
-
-    # If zip: extract to temp folder
-    if zipfile.is_zipfile(input_path):
-        temp_dir = tempfile.mkdtemp(prefix="cit_unpack_")
-        with zipfile.ZipFile(input_path, "r") as z:
-            z.extractall(temp_dir)
-        src_root = Path(temp_dir)
-    else:
-        src_root = input_path
-
     dest_root = input_path.parent / output_name
-    assets_dir = dest_root / "assets"
-    items_dir = assets_dir / "minecraft" / "items"
-    generated_asset_root = assets_dir / generated_folder_name
-
-    ensure_dir(items_dir)
-    ensure_dir(generated_asset_root / "models" / "item")
-    ensure_dir(generated_asset_root / "textures" / "item")
-
-    # Copy root-level non-assets files/dirs
-    copy_root_files(str(src_root), str(dest_root))
-
-    # Walk CIT source
-    cit_dir = src_root / "assets" / "minecraft" / "optifine" / "cit"
-    if not cit_dir.exists():
-        log(f"No CIT folder found at {cit_dir}; nothing to do.")
-        # cleanup if zip input
-        if temp_dir:
-            shutil.rmtree(temp_dir)
+
+    # Zips are read and written in place; nothing is extracted to disk
+    is_zip = zipfile.is_zipfile(input_path)
+    source = ZipSource(input_path) if is_zip else FolderSource(input_path)
+
+    if not source.has_cit():
+        log(f"No CIT folder found at {source.cit_dir}; nothing to do.")
+        source.close()
         return
 
-    for root, _, files in os.walk(str(cit_dir)):
-        for f in files:
-            src = Path(root) / f
-            process_cit_file(str(src), str(items_dir), str(generated_asset_root), generated_folder_name, block_names)
-
-    # If input was zip: pack back to zip and cleanup extracted folder and temporary dest folder
-    if temp_dir:
-        output_zip = str(dest_root) + ".zip"
-        with zipfile.ZipFile(output_zip, "w", zipfile.ZIP_DEFLATED) as z:
-            for root, _, files in os.walk(str(dest_root)):
-                for f in files:
-                    absf = os.path.join(root, f)
-                    relf = os.path.relpath(absf, str(dest_root))
-                    z.write(absf, relf)
-        # cleanup
-        shutil.rmtree(temp_dir)
-        shutil.rmtree(str(dest_root))
-        log(f"Created patched zip: {output_zip}")
-        print(f"Patched pack created: {output_zip}")
+    # Output locations are fixed for the whole pack; build them once
+    models_item_dir = f"assets/{generated_folder_name}/models/item"
+    textures_item_dir = f"assets/{generated_folder_name}/textures/item"
+
+    if is_zip:
+        output_path = str(dest_root) + ".zip"
+        output = ZipOutput(output_path)
+    else:
+        output_path = dest_root
+        output = FolderOutput(dest_root)
+        # Every CIT output lands in one of these; they are created here once and
+        # per-file writes never create directories themselves
+        for rel in (ITEMS_DIR, models_item_dir, textures_item_dir):
+            ensure_dir(output.path(rel))
+
+    try:
+        # Copy root-level non-assets files/dirs
+        source.copy_root_files(output)
+
+        # Single pass over the CIT walk, bucketing entries by extension
+        buckets = {".properties": [], ".png": [], ".json": []}
+        ignored = []
+        for entry in source.iter_cit():
+            name = entry.name
+            dot = name.rfind('.')
+            buckets.get(name[dot:].lower() if dot > 0 else "", ignored).append(entry)
+
+        if VERBOSE:
+            for entry in ignored:
+                log(f"Ignored CIT file type: {entry.path}")
+
+        copy_cit_textures(buckets[".png"], source, output, textures_item_dir, workers)
+        write_cit_models(buckets[".json"], source, output, models_item_dir, generated_folder_name, workers, input_path, is_zip)
+
+        # Item JSONs are merged in memory and written once at the end
+        item_json_accum = {}
+        for entry, props in load_all_properties(buckets[".properties"], source, workers):
+            add_properties_cases(entry, props, output, generated_folder_name, block_names, item_json_accum)
+        flush_item_jsons(output, item_json_accum)
+    finally:
+        output.close()
+        source.close()
+
+    if is_zip:
+        log(f"Created patched zip: {output_path}")
+        print(f"Patched pack created: {output_path}")
     else:
-        log(f"Created patched folder: {dest_root}")
-        print(f"Patched pack created: {dest_root}")
+        log(f"Created patched folder: {output_path}")
+        print(f"Patched pack created: {output_path}")
 
 # ---------------------------
 # Entry point
 # ---------------------------
 
 def main():
-    global GLOBAL_CONFIG
+    global GLOBAL_CONFIG, VERBOSE, PRETTY_JSON
     GLOBAL_CONFIG = load_config()
+    VERBOSE = GLOBAL_CONFIG["verbose"]
+    PRETTY_JSON = GLOBAL_CONFIG["pretty_json"]
 
     block_names = load_block_names()
 
@@ -591,7 +1054,7 @@ def main():
         if user_input:
             generated_folder_name = user_input
 
-    process_pack(input_path, generated_folder_name, block_names)
+    process_pack(input_path, generated_folder_name, block_names, GLOBAL_CONFIG["workers"])
 
 if __name__ == "__main__":
     main()
\ No newline at end of file